@@ -1,25 +1,214 @@
+import base64
 import logging
 import os
-from typing import Any, Optional
+import re
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from queue import Queue
+from threading import Lock, Thread
+from typing import Any, Optional, Union
+
+import lxml.html
+import urllib3
 
 import my_libs.utils as Utils
 from my_libs.tosshin.tosshin_xlsx_writer import MyTosshinExcel, TosshinData
+from my_libs.web_driver import DriverPool
 from selenium import webdriver
+from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.by import By
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+DEFAULT_POOL_SIZE = 4
+FETCH_CACHE_SIZE = 4096
+ROW_QUEUE_SIZE = 64
+# O_BINARY (Windows only) stops the CRT from translating newlines in image data
+SCREENSHOT_OPEN_FLAGS = (
+    os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+)
+
+_WS_RE = re.compile(r"\s+")
+# Prices in US dollars, the currency of the workbook's "$" accounting format
+_USD_PRICE_RE = re.compile(r"\$\s*(\d[\d,]*(?:\.\d+)?)")
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/116.0.5845.96 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml",
+}
+NO_RESULTS_XPATH = "//div[contains(@class, 'parts-search__result__nothing')]//strong"
+# Maker, weight and price cells of the first data row of the first (OEM) table.
+OEM_ROW_CELLS_XPATH = (
+    "((//table[contains(@class, 'parts-search__result__table')])[1]//tr[td])[1]"
+    "/td[position() >= 2 and position() <= 4]"
+)
+
+# The browser fallback only runs for pages whose results are rendered by JS, so
+# wait until either the OEM table or the "Nothing found!" message shows up.
+RESULTS_WAIT_TIMEOUT = 10
+RESULTS_READY = EC.any_of(
+    EC.presence_of_element_located(
+        (By.CSS_SELECTOR, "table.parts-search__result__table tbody tr")
+    ),
+    EC.presence_of_element_located(
+        (By.CSS_SELECTOR, "div.parts-search__result__nothing strong")
+    ),
+)
+
+# Returns null when "Nothing found!" is shown, otherwise the maker, weight and
+# price of the first row of the OEM table. Throws if the table is missing.
+OEM_ROW_SCRIPT = """
+if (document.querySelector('div.parts-search__result__nothing strong')) {
+    return null;
+}
+const row = document.querySelector('table.parts-search__result__table tbody tr');
+if (!row) {
+    throw new Error('OEM table not found');
+}
+const cells = row.querySelectorAll('td');
+return [1, 2, 3].map((i) => cells[i].innerText.trim());
+"""
+
+HTTP_TIMEOUT = urllib3.Timeout(connect=5.0, read=15.0)
+HTTP_RETRIES = urllib3.Retry(total=3, backoff_factor=0.3)
+
+# Parsed OEM rows by keyword, least recently used first. Holds no reference to
+# the HTTP pool; it is cleared at the start of each scrape so prices are fresh.
+_OemRow = tuple[str, str, Optional[Union[float, str]]]
+_fetch_cache: OrderedDict[str, Optional[_OemRow]] = OrderedDict()
+_fetch_cache_lock = Lock()
+
+
+class _NotRenderedError(Exception):
+    """Raised when the search results are missing from a page's static HTML."""
+
+
+def create_http_pool(pool_size: int = DEFAULT_POOL_SIZE) -> urllib3.PoolManager:
+    """
+    Create the connection pool shared by every HTTP request of a scrape.
+
+    All requests go to the same host, so one pool of keep-alive connections,
+    sized for the scraper threads, is enough.
+
+    Args:
+        pool_size (int): The number of scraper threads that will share the pool.
+
+    Returns:
+        urllib3.PoolManager: A thread-safe pool manager.
+    """
+    return urllib3.PoolManager(
+        num_pools=1,
+        maxsize=max(4, pool_size),
+        block=True,
+        timeout=HTTP_TIMEOUT,
+        retries=HTTP_RETRIES,
+    )
 
-SCREENSHOTS_LIST = []
+
+def _save_screenshot(image_data: str, screenshot_path: str) -> None:
+    """
+    Decode a captured screenshot and write it to disk. Runs on the screenshot executor.
+
+    Args:
+        image_data (str): The base64-encoded image returned by the browser.
+        screenshot_path (str): The file path to write the screenshot to.
+    """
+    image = memoryview(base64.b64decode(image_data))
+    try:
+        # Raw file descriptor: the whole image is written with as few syscalls as
+        # possible and without the buffered file object wrapper.
+        fd = os.open(screenshot_path, SCREENSHOT_OPEN_FLAGS, 0o644)
+        try:
+            while image:
+                image = image[os.write(fd, image) :]
+        finally:
+            os.close(fd)
+        logging.info(f"Screenshot saved at {screenshot_path}")
+    except OSError as e:
+        logging.error(f"Failed to save screenshot at {screenshot_path}: {e}")
+
+
+def _write_rows(
+    workbook: MyTosshinExcel, rows: Queue[Optional[dict[TosshinData, Any]]]
+) -> None:
+    """
+    Write queued rows to the workbook until the end-of-rows marker (None) arrives.
+
+    Runs on the writer thread, the only thread that touches the workbook while
+    scraping is in progress.
+
+    Args:
+        workbook (MyTosshinExcel): The workbook to write the rows to.
+        rows (Queue[Optional[dict[TosshinData, Any]]]): The queue filled by the scraper threads.
+    """
+    while True:
+        data = rows.get()
+        if data is None:
+            return
+        try:
+            workbook.write_data_row(data)
+        except Exception:
+            # Already logged by write_data_row; keep draining so producers never
+            # block on a full queue.
+            pass
+
+
+def _scrape_one(
+    keyword: str,
+    rows: Queue[Optional[dict[TosshinData, Any]]],
+    http: urllib3.PoolManager,
+    driver_pool: DriverPool,
+    screenshot_folder_path: Optional[str],
+    screenshot_executor: Optional[ThreadPoolExecutor],
+) -> None:
+    """
+    Scrape a single keyword on a scraper thread and queue its row for the writer.
+
+    Failures are logged and produce no row.
+
+    Args:
+        keyword (str): The search keyword for fetching data.
+        rows (Queue[Optional[dict[TosshinData, Any]]]): The queue consumed by the writer thread.
+        http (urllib3.PoolManager): The HTTP connection pool shared by the scraper threads.
+        driver_pool (DriverPool): The pool of WebDrivers shared by the scraper threads.
+        screenshot_folder_path (Optional[str]): The directory where screenshots will be saved, or None if screenshots are disabled.
+        screenshot_executor (Optional[ThreadPoolExecutor]): The executor that writes screenshot files.
+    """
+    logging.info("Fetching data for search keyword: %s", keyword)
+    try:
+        data = scrape_keyword_data(
+            keyword, http, driver_pool, screenshot_folder_path, screenshot_executor
+        )
+    except Exception as e:
+        Utils.handle_scraping_exception(e, keyword)
+        return
+    if data:
+        rows.put(data)
 
 
 def read_keywords(
-    driver: webdriver.Chrome, keywords: list[str], output_folder: str
+    keywords: list[str],
+    output_folder: str,
+    http: urllib3.PoolManager,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    take_screenshots: bool = False,
+    lean: bool = True,
 ) -> None:
     """
     Scrape and store product data for a list of keywords.
 
+    Keywords are scraped concurrently by a pool of threads in this process. Pages
+    are fetched over HTTP, and WebDrivers are only started, one per thread at most,
+    when a page needs the browser. Results go through a bounded queue to a single
+    writer thread, so writing row N overlaps fetching the following keywords.
+
     Args:
-        driver (webdriver.Chrome): The Selenium WebDriver instance used for web interaction.
         keywords (list[str]): A list of search keywords to fetch data for.
         output_folder (str): The directory where images and workbooks will be saved.
+        http (urllib3.PoolManager): The HTTP connection pool used for every page request.
+        pool_size (int): The maximum number of scraper threads. Default is DEFAULT_POOL_SIZE.
+        take_screenshots (bool): Whether to save a screenshot of each search page. Default is False.
+        lean (bool): Whether browsers skip images, stylesheets, fonts and analytics. Ignored when take_screenshots is set. Default is True.
 
     Returns:
         None: This function does not return a value. It initializes a workbook and processes each keyword.
@@ -30,70 +219,330 @@ def read_keywords(
 
     logging.info("Fetching and saving data for keywords: %s", ", ".join(keywords))
 
+    stripped_keywords = [keyword.strip() for keyword in keywords]
+    if "" in stripped_keywords:
+        logging.warning("Empty search keyword encountered. Skipping.")
+    # Drop repeated keywords while keeping their first-seen order
+    search_keywords = list(dict.fromkeys(k for k in stripped_keywords if k))
+    if not search_keywords:
+        return
+
     # Initialize the workbook
     workbook = MyTosshinExcel(output_folder)
-    screenshot_folder_path = Utils.create_subfolder(
-        output_folder, "Tosshin Screenshots"
+    screenshot_folder_path = (
+        Utils.create_subfolder(output_folder, "Tosshin Screenshots")
+        if take_screenshots
+        else None
     )
 
-    for search_keyword in keywords:
-        search_keyword = search_keyword.strip()
-        if search_keyword:
-            logging.info("Fetching data for search keyword: %s", search_keyword)
-            scrape_keyword_data(
-                driver,
-                search_keyword,
-                workbook,
-                screenshot_folder_path,
-            )
-        else:
-            logging.warning("Empty search keyword encountered. Skipping.")
+    workers = max(1, min(pool_size, len(search_keywords)))
+    logging.info("Starting %d scraper thread(s)...", workers)
+    # Screenshots should show the page as styled, so they need full page loads
+    driver_pool = DriverPool(workers, lazy=True, lean=lean and not take_screenshots)
+    screenshot_executor = (
+        ThreadPoolExecutor(max_workers=1) if take_screenshots else None
+    )
+    rows: Queue[Optional[dict[TosshinData, Any]]] = Queue(maxsize=ROW_QUEUE_SIZE)
+    writer = Thread(
+        target=_write_rows, args=(workbook, rows), name="TosshinWriter", daemon=True
+    )
+    writer.start()
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for keyword in search_keywords:
+                executor.submit(
+                    _scrape_one,
+                    keyword,
+                    rows,
+                    http,
+                    driver_pool,
+                    screenshot_folder_path,
+                    screenshot_executor,
+                )
+    finally:
+        rows.put(None)
+        writer.join()
+        # Flush pending screenshots before the drivers are closed.
+        if screenshot_executor is not None:
+            screenshot_executor.shutdown(wait=True)
+        driver_pool.cleanup()
 
-    # for row, file in enumerate(SCREENSHOTS_LIST):
-    #     workbook.add_screenshot(file, row)
     workbook.save_workbook()
 
 
 def scrape_keyword_data(
-    driver: webdriver.Chrome,
     keyword: str,
-    workbook: MyTosshinExcel,
-    screenshot_folder_path: str,
-) -> None:
+    http: urllib3.PoolManager,
+    driver_pool: DriverPool,
+    screenshot_folder_path: Optional[str] = None,
+    screenshot_executor: Optional[ThreadPoolExecutor] = None,
+) -> Optional[dict[TosshinData, Any]]:
     """
-    Scrape data for a keyword and write it to the worksheet.
+    Scrape data for a keyword, using the browser only if the page needs rendering.
 
     Args:
-        driver (webdriver.Chrome): The Selenium WebDriver instance for web interaction.
         keyword (str): The search keyword for fetching data.
-        workbook (MyTosshinExcel): The workbook instance to write the data to.
-        image_dir (str): The os path of the image folder that stored screenshots
+        http (urllib3.PoolManager): The HTTP connection pool to fetch the page with.
+        driver_pool (DriverPool): The pool to borrow a WebDriver from when the browser is needed.
+        screenshot_folder_path (Optional[str]): The directory to save a screenshot of the search page to when it has results. Screenshots require loading the page in the browser. Default is None (no screenshot).
+        screenshot_executor (Optional[ThreadPoolExecutor]): The executor that writes screenshot files. If None, files are written on the calling thread.
 
     Returns:
-        None: This function does not return a value. It handles data scraping and writing to the workbook.
+        (Optional[dict[TosshinData, Any]]): The scraped data including its URL, or None if no results are found.
     """
     url = Utils.build_tosshin_url(keyword)
     logging.info("Fetching data from URL: %s", url)
-    driver.get(url)
+    data = None
+    use_browser = bool(screenshot_folder_path)
 
-    data = fetch_data(driver, keyword)
+    if not use_browser:
+        try:
+            data = fetch_data(keyword, http)
+        except _NotRenderedError:
+            logging.info(
+                "Search results are not in the static HTML for '%s'. Falling back to the browser.",
+                keyword,
+            )
+            use_browser = True
+
+    if use_browser:
+        driver = driver_pool.acquire()
+        try:
+            driver.get(url)
+
+            data = fetch_data_with_driver(driver, keyword)
 
-    screenshot_path = os.path.join(screenshot_folder_path, f"{keyword} screenshot.png")
-    if Utils.take_screenshot(screenshot_path, driver):
-        SCREENSHOTS_LIST.append(screenshot_path)
+            # Searches without results produce no row, so skip their screenshot
+            if data and screenshot_folder_path:
+                screenshot_path = os.path.join(
+                    screenshot_folder_path, f"{keyword} screenshot.jpg"
+                )
+                capture_screenshot(driver, screenshot_path, screenshot_executor)
+        finally:
+            driver_pool.release(driver)
 
     if data:
         data[TosshinData.URL] = url
-        workbook.write_data_row(data)
+        return data
+
+    logging.warning("No result found for the keyword: %s", keyword)
+    return None
+
+
+def capture_screenshot(
+    driver: webdriver.Chrome,
+    screenshot_path: str,
+    screenshot_executor: Optional[ThreadPoolExecutor] = None,
+) -> None:
+    """
+    Capture the whole current page as a JPEG through the Chrome DevTools Protocol.
+
+    Only the capture uses the driver; decoding and writing the file happen on the
+    screenshot executor so scraping can move on to the next keyword.
+
+    Args:
+        driver (webdriver.Chrome): The Selenium WebDriver instance showing the page.
+        screenshot_path (str): The file path to write the screenshot to.
+        screenshot_executor (Optional[ThreadPoolExecutor]): The executor that writes the file. If None, it is written on the calling thread.
+    """
+    # Clip to the full content size so the whole page is captured, not just the
+    # viewport of the headless window
+    metrics = driver.execute_cdp_cmd("Page.getLayoutMetrics", {})
+    content = metrics.get("cssContentSize") or metrics["contentSize"]
+    result = driver.execute_cdp_cmd(
+        "Page.captureScreenshot",
+        {
+            "format": "jpeg",
+            "quality": 60,
+            "captureBeyondViewport": True,
+            "clip": {
+                "x": 0,
+                "y": 0,
+                "width": content["width"],
+                "height": content["height"],
+                "scale": 1,
+            },
+        },
+    )
+    if screenshot_executor is not None:
+        screenshot_executor.submit(_save_screenshot, result["data"], screenshot_path)
     else:
-        logging.warning("No result found for the keyword: %s", keyword)
+        _save_screenshot(result["data"], screenshot_path)
+
+
+def fetch_page(url: str, http: urllib3.PoolManager) -> lxml.html.HtmlElement:
+    """
+    Download a Tosshin page over HTTP and parse it.
+
+    Args:
+        url (str): The URL of the page to fetch.
+        http (urllib3.PoolManager): The HTTP connection pool to fetch the page with.
+
+    Returns:
+        lxml.html.HtmlElement: The root element of the parsed page.
+
+    Raises:
+        RuntimeError: If the server does not answer with HTTP 200.
+    """
+    response = http.request("GET", url, headers=HTTP_HEADERS)
+    if response.status != 200:
+        raise RuntimeError(f"Unexpected HTTP status {response.status} for {url}")
+    return lxml.html.fromstring(response.data)
+
+
+def parse_price(price: str) -> Optional[Union[float, str]]:
+    """
+    Convert a scraped US dollar price such as "$1,234.50" to a number.
+
+    The workbook formats numeric prices as dollars, so prices in any other
+    currency (e.g. "¥12,345") or without a number (e.g. "Ask") are kept as text.
+
+    Args:
+        price (str): The price text from the OEM table.
+
+    Returns:
+        (Optional[Union[float, str]]): The numeric price, the original text if it is not a dollar amount, or None if it is empty.
+    """
+    if not price:
+        return None
+    match = _USD_PRICE_RE.fullmatch(price.strip())
+    if match is None:
+        logging.warning(
+            "Price is not a US dollar amount, keeping it as text: %s", price
+        )
+        return price
+    return float(match.group(1).replace(",", ""))
+
+
+def normalize_keyword(keyword: str) -> str:
+    """
+    Normalize a search keyword so equivalent spellings share a cache entry.
+
+    Args:
+        keyword (str): The search keyword.
+
+    Returns:
+        str: The keyword trimmed, lower-cased and with inner whitespace collapsed.
+    """
+    return _WS_RE.sub(" ", keyword).strip().lower()
 
 
 def fetch_data(
+    keyword: str, http: urllib3.PoolManager
+) -> Optional[dict[TosshinData, Any]]:
+    """
+    Fetch the first row of the OEM table for a keyword over HTTP.
+
+    Repeated keywords are served from an in-memory cache keyed by the normalized keyword.
+
+    Args:
+        keyword (str): The search keyword for which data is being fetched.
+        http (urllib3.PoolManager): The HTTP connection pool to fetch the page with.
+
+    Returns:
+        (Optional[dict[TosshinDataKey, Any]]): A dictionary containing the extracted data, or None if no results are found.
+
+    Raises:
+        _NotRenderedError: If the page needs the browser to show its results.
+    """
+    result = _fetch_cached(keyword, http)
+    if result is None:
+        logging.warning("No results found for the search query.")
+        return None
+
+    maker, weight, price = result
+    logging.info(
+        f"Extracted Data - Keyword: {keyword}, Maker: {maker}, Weight: {weight}, Price: {price}"
+    )
+
+    return {
+        TosshinData.KEYWORD: keyword,
+        TosshinData.MAKER: maker,
+        TosshinData.WEIGHT: weight,
+        TosshinData.PRICE: price,
+    }
+
+
+def clear_fetch_cache() -> None:
+    """
+    Drop every cached OEM row so the next fetches hit the site again.
+    """
+    with _fetch_cache_lock:
+        _fetch_cache.clear()
+
+
+def _fetch_cached(keyword: str, http: urllib3.PoolManager) -> Optional[_OemRow]:
+    """
+    Return the OEM row for a keyword, fetching it only on a cache miss.
+
+    The normalized keyword is only the cache key; a miss always requests the URL
+    built from the keyword as given.
+
+    Exceptions are not cached, so pages that need the browser or failed requests
+    are retried on the next call. When the cache is full the least recently used
+    entry is dropped.
+
+    Args:
+        keyword (str): The search keyword.
+        http (urllib3.PoolManager): The HTTP connection pool to fetch the page with on a miss.
+
+    Returns:
+        (Optional[tuple[str, str, Optional[Union[float, str]]]]): The maker, weight and parsed price, or None if no results are found.
+
+    Raises:
+        _NotRenderedError: If neither the OEM table nor the "Nothing found!" message is in the static HTML.
+    """
+    key = normalize_keyword(keyword)
+    with _fetch_cache_lock:
+        if key in _fetch_cache:
+            _fetch_cache.move_to_end(key)
+            return _fetch_cache[key]
+
+    result = _fetch_oem_row(keyword, http)
+
+    with _fetch_cache_lock:
+        _fetch_cache[key] = result
+        _fetch_cache.move_to_end(key)
+        if len(_fetch_cache) > FETCH_CACHE_SIZE:
+            _fetch_cache.popitem(last=False)
+    return result
+
+
+def _fetch_oem_row(keyword: str, http: urllib3.PoolManager) -> Optional[_OemRow]:
+    """
+    Download the search page for a keyword and extract the OEM row.
+
+    Args:
+        keyword (str): The search keyword.
+        http (urllib3.PoolManager): The HTTP connection pool to fetch the page with.
+
+    Returns:
+        (Optional[tuple[str, str, Optional[Union[float, str]]]]): The maker, weight and parsed price, or None if no results are found.
+
+    Raises:
+        _NotRenderedError: If neither the OEM table nor the "Nothing found!" message is in the static HTML.
+    """
+    page = fetch_page(Utils.build_tosshin_url(keyword), http)
+
+    # Check if the "Nothing found!" message is present
+    if page.xpath(NO_RESULTS_XPATH):
+        return None
+
+    cells = page.xpath(OEM_ROW_CELLS_XPATH)
+    if len(cells) != 3:
+        raise _NotRenderedError(keyword)
+
+    maker, weight, price = (cell.text_content().strip() for cell in cells)
+    return _WS_RE.sub(" ", maker).strip(), weight, parse_price(price)
+
+
+def fetch_data_with_driver(
     driver: webdriver.Chrome, keyword: str
 ) -> Optional[dict[TosshinData, Any]]:
     """
-    Extract data from the first row of the OEM table on the Tosshin page.
+    Extract data from the first row of the OEM table of a page loaded in the browser.
+
+    Waits up to RESULTS_WAIT_TIMEOUT seconds for the results to render first.
 
     Args:
         driver (webdriver.Chrome): The Selenium WebDriver instance used for web interaction.
@@ -103,26 +552,21 @@ def fetch_data(
         (Optional[dict[TosshinDataKey, Any]]): A dictionary containing the extracted data, or None if no results are found.
     """
     try:
-        # Check if the "Nothing found!" message is present
-        no_results_message = driver.find_elements(
-            By.CSS_SELECTOR, "div.parts-search__result__nothing strong"
-        )
-        if no_results_message:
+        WebDriverWait(driver, RESULTS_WAIT_TIMEOUT).until(RESULTS_READY)
+    except TimeoutException:
+        logging.error("Timed out waiting for the search results to render.")
+        return None
+
+    try:
+        # A single script call replaces one WebDriver round trip per element
+        result = driver.execute_script(OEM_ROW_SCRIPT)
+        if result is None:
             logging.warning("No results found for the search query.")
             return None
 
-        # Find the OEM table. Assuming the first table is OEM.
-        oem_table = driver.find_element(
-            By.CSS_SELECTOR, "table.parts-search__result__table"
-        )
-        first_row = oem_table.find_element(By.CSS_SELECTOR, "tbody > tr:first-child")
-
-        # Extract data from the first row
-        maker = first_row.find_element(By.CSS_SELECTOR, "td:nth-child(2)").text.strip()
-        weight = first_row.find_element(By.CSS_SELECTOR, "td:nth-child(3)").text.strip()
-        price = first_row.find_element(By.CSS_SELECTOR, "td:nth-child(4)").text.strip()
-
-        maker = " ".join(maker.split())
+        maker, weight, price = result
+        maker = _WS_RE.sub(" ", maker).strip()
+        price = parse_price(price)
 
         logging.info(
             f"Extracted Data - Keyword: {keyword}, Maker: {maker}, Weight: {weight}, Price: {price}"
@@ -1,33 +1,49 @@
 import logging
 from time import perf_counter
 
-from my_libs.tosshin.tosshin_data_extraction import read_keywords
-from my_libs.web_driver import initialize_driver
-
-
-def scrape(keywords: list[str], output_folder: str) -> None:
+from my_libs.tosshin.tosshin_data_extraction import (
+    DEFAULT_POOL_SIZE,
+    clear_fetch_cache,
+    create_http_pool,
+    read_keywords,
+)
+
+
+def scrape(
+    keywords: list[str],
+    output_folder: str,
+    pool_size: int = DEFAULT_POOL_SIZE,
+    take_screenshots: bool = False,
+    lean: bool = True,
+) -> None:
     """
     Scrape function to execute the web scraping process.
 
-    This function sets up logging, initializes the WebDriver, handles cookies,
-    creates a new workbook, fetches and saves product data based on provided
+    This function sets up logging, clears the fetch cache left by earlier
+    scrapes, opens the HTTP connection pool shared by all requests, starts a
+    pool of scraper workers, fetches and saves product data based on provided
     keywords, and saves the workbook to the specified output folder.
 
     Args:
         keywords (list[str]): List of search keywords to scrape data for.
         output_folder (str): Path to the folder where the output files will be saved.
+        pool_size (int): Maximum number of concurrent scraper workers.
+        take_screenshots (bool): Whether to save a screenshot of each search page.
+        lean (bool): Whether browsers skip images, stylesheets, fonts and analytics.
+            Ignored when take_screenshots is set.
     """
     # Configure logging
     start_time = perf_counter()
     logging.info("Starting the Tosshin scrape execution...")
 
-    # Initialize the WebDriver
-    driver = initialize_driver(headless=True)
-
     try:
         # Fetch and store product data
         logging.info("Fetching and saving product data...")
-        read_keywords(driver, keywords, output_folder)
+        clear_fetch_cache()
+        with create_http_pool(pool_size) as http:
+            read_keywords(
+                keywords, output_folder, http, pool_size, take_screenshots, lean
+            )
 
         logging.info("Workbook saved successfully to '%s'.", output_folder)
 
@@ -35,11 +51,6 @@ def scrape(keywords: list[str], output_folder: str) -> None:
         logging.error("An error occurred during execution: %s", e)
 
     finally:
-        # Close the WebDriver properly
-        logging.info("Closing WebDriver...")
-        driver.quit()
-        logging.info("WebDriver closed.")
-
         # Log completion message with additional context
         end_time = perf_counter()
         run_time = end_time - start_time
@@ -31,15 +31,24 @@ class TosshinData(Enum):
     URL = DataAttr()
 
 
+MAKER_COL = Utils.get_enum_col(TosshinData.MAKER)
+KEYWORD_COL = Utils.get_enum_col(TosshinData.KEYWORD)
+WEIGHT_COL = Utils.get_enum_col(TosshinData.WEIGHT)
+PRICE_COL = Utils.get_enum_col(TosshinData.PRICE)
+
+
 class MyTosshinExcel:
     """
     Manages an Excel workbook for Tosshin data, including creating, saving, and writing data to the workbook.
 
     Attributes:
         workbook (xlsxwriter.Workbook): The Excel workbook instance.
+        output_file (str): The path the workbook is saved to.
+        temp_file (str): The sibling file the workbook is written to before it replaces `output_file`.
         formats (dict[FormatType, xlsxwriter.format.Format]): Formatting styles for the workbook.
         worksheet (xlsxwriter.worksheet.Worksheet): The worksheet for Tosshin data.
         row_count (int): The current row count in the worksheet, starting from 1 after the header.
+        col_widths (list[int]): The longest text written so far in each column, used to size columns on save.
 
     Methods:
         __init__(output_dir: str) -> None:
@@ -49,7 +58,7 @@ class MyTosshinExcel:
             Creates and returns a new Excel workbook, logging the creation process.
 
         save_workbook() -> None:
-            Saves and closes the workbook, handling file permission errors and logging success or failure.
+            Sizes the columns, then saves and closes the workbook, handling file permission errors and logging success or failure.
 
         add_headers() -> None:
             Writes the header row to the worksheet and increments the row count.
@@ -72,40 +81,57 @@ class MyTosshinExcel:
         self.worksheet: xlsxwriter.worksheet.Worksheet = self.workbook.add_worksheet(
             "Tosshin Data"
         )
-        # self.screenshot_sheet: xlsxwriter.worksheet.Worksheet = (
-        #     self.workbook.add_worksheet("Screenshots")
-        # )
         self.row_count = 0
+        self.col_widths: list[int] = [0] * (Utils.get_enum_last_col(TosshinData) + 1)
+        # Resolved once so cell writes pass Format handles instead of looking them up
+        self._fmt_header = self.formats[FormatType.HEADER]
+        self._fmt_hyperlink = self.formats[FormatType.HYPERLINK]
+        self._fmt_text = self.formats[FormatType.TEXT]
+        self._fmt_currency = self.formats[FormatType.CURRENCY]
         self.add_headers()
 
     def create_workbook(self, output_dir: str) -> xlsxwriter.Workbook:
         """
         Create a new Excel workbook and add a worksheet for Tosshin data.
 
+        The workbook is opened in constant_memory mode so rows are streamed to disk
+        as they are written instead of being held until the workbook is closed.
+        It is written to a temporary file next to the output file, which is moved
+        into place by `save_workbook`, so an open copy of the previous output does
+        not block writing.
+
         Returns:
             xlsxwriter.Workbook: A new workbook instance.
         """
-        output_file = os.path.join(output_dir, "Tosshin data.xlsx")
-        logging.info("Creating new workbook at %s", output_file)
-        workbook = xlsxwriter.Workbook(output_file)
+        self.output_file = os.path.join(output_dir, "Tosshin data.xlsx")
+        self.temp_file = f"{self.output_file}.tmp.{os.getpid()}"
+        logging.info("Creating new workbook at %s", self.output_file)
+        workbook = xlsxwriter.Workbook(self.temp_file, {"constant_memory": True})
         logging.info("Workbook created successfully")
         return workbook
 
     def save_workbook(self) -> None:
         """
-        Save the workbook by closing it.
+        Save the workbook by closing it and moving it over the output file.
 
         Notes:
-            - Autofits columns in the worksheet.
-            - Saves and closes the workbook, handling any errors related to file permissions.
+            - Sizes columns from the widths tracked while writing, since autofit() is unavailable in constant_memory mode.
+            - Saves and closes the workbook to its temporary file, then atomically replaces the output file with it.
+            - Handles any errors related to file permissions.
             - Logs a message indicating success or an error if the workbook cannot be saved.
             - Retries if the file is open elsewhere, prompting the user to close it and retry.
         """
-        logging.info("Finalizing workbook by applying autofit and saving...")
-        self.worksheet.autofit()
+        logging.info("Finalizing workbook by sizing columns and saving...")
+        for col, width in enumerate(self.col_widths):
+            self.worksheet.set_column(col, col, width + 2)
+        closed = False
         while True:
             try:
-                self.workbook.close()
+                if not closed:
+                    self.workbook.close()
+                    closed = True
+                # Only blocks if the output file itself is locked (e.g. open in Excel)
+                os.replace(self.temp_file, self.output_file)
                 logging.info("Workbook successfully saved.")
                 break  # Exit the loop if the workbook is saved successfully
             except OSError as e:
@@ -130,7 +156,9 @@ class MyTosshinExcel:
         Writes the header row to the worksheet and increments the row count.
         """
         headers = Utils.get_enum_headers_row(TosshinData)
-        self.worksheet.write_row(0, 0, headers, self.formats[FormatType.HEADER])
+        self.worksheet.write_row(0, 0, headers, self._fmt_header)
+        for col, header in enumerate(headers):
+            self._track_width(col, header)
         self.row_count += 1
 
     def write_data_row(
@@ -144,28 +172,41 @@ class MyTosshinExcel:
             data (dict[TosshinDataKey, Any]): A dictionary containing Tosshin data to be written to the worksheet.
         """
         try:
-            # Write data to the corresponding columns
-
-            fields_to_write = [
-                (TosshinData.MAKER, TosshinData.URL),
-                (TosshinData.KEYWORD, None),
-                (TosshinData.WEIGHT, None),
-                (TosshinData.PRICE, None),
-            ]
-
-            for data_key, url_key in fields_to_write:
-                is_currency = data_key == TosshinData.PRICE
-
-                Utils.write_data(
-                    self.worksheet,
-                    self.formats,
-                    self.row_count,
-                    Utils.get_enum_col(data_key),
-                    data,
-                    data_key,
-                    url_key=url_key,
-                    is_currency=is_currency,
+            # Cell types are fixed, so write them directly instead of through
+            # the generic Utils.write_data dispatch
+            worksheet = self.worksheet
+            row = self.row_count
+            maker = data.get(TosshinData.MAKER) or ""
+            keyword = data.get(TosshinData.KEYWORD) or ""
+            weight = data.get(TosshinData.WEIGHT) or ""
+            price = data.get(TosshinData.PRICE)
+            url = data.get(TosshinData.URL)
+
+            if url:
+                worksheet.write_url(
+                    row, MAKER_COL, url, self._fmt_hyperlink, string=maker
                 )
+            else:
+                worksheet.write_string(row, MAKER_COL, maker, self._fmt_text)
+            worksheet.write_string(row, KEYWORD_COL, keyword, self._fmt_text)
+            worksheet.write_string(row, WEIGHT_COL, weight, self._fmt_text)
+            # Dollar prices are parsed to numbers during extraction; anything
+            # else (e.g. "Ask" or another currency) is kept as text
+            if isinstance(price, (int, float)):
+                worksheet.write_number(row, PRICE_COL, price, self._fmt_currency)
+                # Size the column for the text Excel shows, not the raw number
+                price_text = f"$ {price:,.2f}"
+            elif price:
+                worksheet.write_string(row, PRICE_COL, price, self._fmt_text)
+                price_text = price
+            else:
+                worksheet.write_blank(row, PRICE_COL, None, self._fmt_currency)
+                price_text = ""
+
+            self._track_width(MAKER_COL, maker)
+            self._track_width(KEYWORD_COL, keyword)
+            self._track_width(WEIGHT_COL, weight)
+            self._track_width(PRICE_COL, price_text)
 
             self.row_count += 1
 
@@ -173,8 +214,14 @@ class MyTosshinExcel:
             logging.error(f"Failed to write data to row {self.row_count}: {e}")
             raise
 
-    # def add_screenshot(self, file_path: str, row_idx: int) -> None:
-    #     logging.info(f"Embedding screenshot at row {row_idx+1}: {file_path}")
-    #     self.screenshot_sheet.set_column_pixels(0, 0, 500)
-    #     self.screenshot_sheet.set_row_pixels(row_idx, 500)
-    #     self.screenshot_sheet.embed_image(row_idx, 0, file_path)
+    def _track_width(self, col: int, value: Any) -> None:
+        """
+        Record the text length of a cell value if it is the widest in its column.
+
+        Args:
+            col (int): The column index of the cell.
+            value (Any): The value written to the cell.
+        """
+        width = len(str(value)) if value is not None else 0
+        if width > self.col_widths[col]:
+            self.col_widths[col] = width
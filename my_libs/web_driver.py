@@ -20,17 +20,70 @@ from webdriver_manager.chrome import ChromeDriverManager
 os.environ["WDM_LOG"] = str(logging.NOTSET)
 cookie_update_lock = Lock()
 
+# Content settings value 2 means "block"
+LEAN_CONTENT_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.stylesheets": 2,
+    "profile.managed_default_content_settings.fonts": 2,
+}
+LEAN_BLOCKED_URLS = [
+    "*.gif",
+    "*.jpg",
+    "*.jpeg",
+    "*.png",
+    "*.svg",
+    "*.webp",
+    "*.woff",
+    "*.woff2",
+    "*.ttf",
+    "*google-analytics.com*",
+    "*googletagmanager.com*",
+    "*analytics.js",
+]
+
 
 class DriverPool:
-    def __init__(self, max_workers: int) -> None:
-        logging.info(f"Initializing driver pool with {max_workers} drivers...")
+    def __init__(
+        self, max_workers: int, lazy: bool = False, lean: bool = False
+    ) -> None:
+        """
+        Create a pool of up to `max_workers` WebDrivers.
+
+        Args:
+            max_workers (int): The maximum number of drivers in the pool.
+            lazy (bool): Start drivers on demand in `acquire` instead of upfront. Default is False.
+            lean (bool): Start drivers that skip images, stylesheets, fonts and analytics. Default is False.
+        """
         self.pool = Queue(max_workers)
+        self.max_workers = max_workers
+        self.lean = lean
+        self.created = 0
+        self.lock = Lock()
+        if lazy:
+            logging.info(f"Driver pool will start up to {max_workers} drivers lazily.")
+            return
+
+        logging.info(f"Initializing driver pool with {max_workers} drivers...")
         for _ in range(max_workers):
-            driver = initialize_driver()
+            driver = initialize_driver(lean=lean)
             self.pool.put(driver)
+            self.created += 1
 
     def acquire(self) -> webdriver.Chrome:
-        return self.pool.get()
+        with self.lock:
+            start_new = self.pool.empty() and self.created < self.max_workers
+            if start_new:
+                self.created += 1
+        if not start_new:
+            return self.pool.get()
+
+        # Started outside the lock so other threads are not blocked meanwhile
+        try:
+            return initialize_driver(lean=self.lean)
+        except Exception:
+            with self.lock:
+                self.created -= 1
+            raise
 
     def release(self, driver) -> None:
         self.pool.put(driver)
@@ -41,12 +94,13 @@ class DriverPool:
             close_driver(driver)
 
 
-def initialize_driver(headless: bool = True) -> webdriver.Chrome:
+def initialize_driver(headless: bool = True, lean: bool = False) -> webdriver.Chrome:
     """
     Initializes the Chrome WebDriver with specified options.
 
     Args:
         headless (Optional[bool]): Whether to run Chrome in headless mode. Default is True.
+        lean (Optional[bool]): Whether to block images, stylesheets, fonts and analytics to speed up page loads. Pages will look unstyled in screenshots. Default is False.
 
     Returns:
         webdriver.Chrome: Configured Chrome WebDriver instance.
@@ -64,18 +118,36 @@ def initialize_driver(headless: bool = True) -> webdriver.Chrome:
     chrome_options.add_argument("--log-level=3")
     chrome_options.add_argument("--disable-extensions")
     chrome_options.add_argument("--incognito")
+    if lean:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", LEAN_CONTENT_PREFS)
     try:
         driver = webdriver.Chrome(
             service=ChromeService(ChromeDriverManager().install()),
             options=chrome_options,
         )
-        logging.info(
-            f"Chrome WebDriver initialized successfully with headless mode set to {headless}."
-        )
     except Exception as e:
         logging.error(f"Failed to initialize driver: {e}", exc_info=True)
         raise
 
+    if lean:
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd(
+                "Network.setBlockedURLs", {"urls": LEAN_BLOCKED_URLS}
+            )
+        except Exception as e:
+            logging.error(
+                f"Failed to block resources for lean mode: {e}", exc_info=True
+            )
+            # Chrome is already running; don't leave it behind
+            driver.quit()
+            raise
+
+    logging.info(
+        f"Chrome WebDriver initialized successfully with headless mode set to {headless}."
+    )
+
     return driver
 
 
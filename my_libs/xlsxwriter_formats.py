@@ -21,6 +21,8 @@ class FormatType(Enum):
         DATE: Formatting style for cells containing date values.
         NUMBER: Formatting style for cells containing numeric values.
         ACCOUNTING: Formatting style for cells displaying monetary values.
+        HYPERLINK: Formatting style for cells containing hyperlinks.
+        TEXT: Formatting style for cells containing plain text.
 
     Usage:
         The `FormatType` enum provides standardized formatting options for different types of data when writing to Excel sheets. Each member of the enum corresponds to a specific formatting style that can be applied to cells to ensure consistency and clarity in the presentation of data.
@@ -36,6 +38,8 @@ class FormatType(Enum):
     CURRENCY = auto()
     FILL = auto()
     FILL_URL = auto()
+    HYPERLINK = auto()
+    TEXT = auto()
 
 
 def initialize_formats(
@@ -60,5 +64,7 @@ def initialize_formats(
         FormatType.FILL_URL: workbook.add_format(
             {"bg_color": "#daf2d0", "font_color": "blue", "underline": True}
         ),
+        FormatType.HYPERLINK: workbook.get_default_url_format(),
+        FormatType.TEXT: workbook.add_format({"num_format": "@"}),
     }
     return formats